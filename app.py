@@ -1,32 +1,48 @@
 """
-Flask backend for the **Why Was I Rejected?** resume analyzer.
+Quart (async Flask) backend for the **Why Was I Rejected?** resume analyzer.
 Minimal MVP: accepts raw resume & job‑description text as JSON, sends them to
 OpenAI GPT, and returns the analysis in JSON.
 
 Run locally:
 $ export OPENAI_API_KEY="sk‑..."
+  (or put OPENAI_API_KEY=... in a git-ignored .env; never commit the key)
 $ pip install -r requirements.txt
-$ python app.py
+$ hypercorn --config file:hypercorn_conf.py app:app
 
 Then test with:
 $ curl -X POST http://127.0.0.1:5000/analyze \
   -H "Content-Type: application/json" \
-  -d '{"resume": "...", "job_description": "..."}'
+  -d '{"resume": "...", "job_desc": "..."}'
 """
 
 import os
 import io
-from typing import Dict
-
-from flask import (
-    Flask,
+import atexit
+import gzip
+import asyncio
+import hashlib
+import time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import IO, Any, Dict, List, Optional, Set, Tuple, Union
+
+from quart import (
+    Quart,
+    Response,
     request,
     jsonify,
-    render_template_string,
+    render_template,
     redirect,
     url_for,
 )
+from quart.json.provider import JSONProvider
+from werkzeug.datastructures import FileStorage, MultiDict
+import httpx
+import orjson
 import openai
+import tiktoken
+from openai import AsyncOpenAI, DefaultAioHttpClient
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -34,15 +50,26 @@ load_dotenv()
 # ---------- Optional file‑parsing helpers -----------------------------------
 
 try:
-    import pdfplumber  # type: ignore
-except ImportError:
+    import pymupdf  # type: ignore
+    from pdf_worker import extract_page_range
     pdfplumber = None
+except ImportError:
+    pymupdf = None
+    try:
+        import pdfplumber  # slower pdfminer-based fallback  # type: ignore
+    except ImportError:
+        pdfplumber = None
 
 try:
     import docx  # python‑docx  # type: ignore
 except ImportError:
     docx = None
 
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None  # responses fall back to gzip
+
 
 #------configuration-------#
 
@@ -50,15 +77,84 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise RuntimeError("Set OPENAI_API_KEY env var before starting the server.")
 
-openai.api_key = OPENAI_API_KEY
-
+# Shared async client, opened in ``before_serving`` so its aiohttp session is
+# bound to the server's event loop. aiohttp sidesteps the httpx AsyncClient
+# pool contention that shows up under many concurrent completions.
+client: Optional[AsyncOpenAI] = None
+# The aiohttp transport only reads max_connections and keepalive_expiry.
+# Keep the SDK's 1000-connection cap and hold idle sockets for 60 s instead
+# of httpx's 5 s, so requests arriving after a lull reuse a warm TLS
+# connection rather than handshaking again.
+OPENAI_CONNECTION_LIMITS = httpx.Limits(max_connections=1000, keepalive_expiry=60)
+
+# Buffered analyses start on MODEL_TIER and are re-run one tier up when the
+# reply is missing sections or reports confidence below MIN_CONFIDENCE.
+# Streams can't be escalated once tokens are sent, so they get their own
+# STREAM_MODEL_TIER, which defaults to the previous gpt-4o-mini.
+MODEL_TIERS = {"fast": "gpt-4.1-nano", "balanced": "gpt-4o-mini", "quality": "gpt-4o"}
+MODEL_TIER = os.getenv("MODEL_TIER", "fast")
+STREAM_MODEL_TIER = os.getenv("STREAM_MODEL_TIER", "balanced")
+for _tier in (MODEL_TIER, STREAM_MODEL_TIER):
+    if _tier not in MODEL_TIERS:
+        raise RuntimeError(f"Model tiers must be one of: {', '.join(MODEL_TIERS)}")
+MIN_CONFIDENCE = 0.6
+
+# Concurrent /analyze requests are coalesced into one completion: the worker
+# waits up to BATCH_TIMEOUT_MS for at most BATCH_MAX_SIZE pairs per call.
+BATCH_MAX_SIZE = 8
+BATCH_TIMEOUT_MS = int(os.getenv("BATCH_TIMEOUT_MS", 100))
+
+# Finished analyses keyed by a hash of their inputs, so resubmitting the same
+# resume/job description pair skips the OpenAI round-trip entirely.
+analysis_cache: "TTLCache[str, Dict[str, Any]]" = TTLCache(maxsize=10_000, ttl=3600)
+# /analyze_stream produces prose rather than the structured dict above, so its
+# finished text is kept separately under the same key and only replayed there.
+stream_cache: "TTLCache[str, str]" = TTLCache(maxsize=10_000, ttl=3600)
+
+# PDFs with at least PARALLEL_PDF_MIN_PAGES pages are split into one page
+# range per worker process; shorter ones are not worth the pickling overhead.
+# Workers come from a forkserver: forking this process directly would copy
+# the event loop, aiohttp and the parse threads that submit the work.
+PARALLEL_PDF_MIN_PAGES = 4
+PDF_POOL_WORKERS = os.cpu_count() or 1
+PDF_POOL = ProcessPoolExecutor(
+    max_workers=PDF_POOL_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+)
+# Uploads are parsed on these threads so a large file can't stall the event
+# loop (and every in-flight OpenAI call) while MuPDF/python-docx run. Both
+# pools live for the whole process (one set per hypercorn worker) so no
+# request pays for spawning threads or processes.
+EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="wwir")
+atexit.register(EXECUTOR.shutdown)
+atexit.register(PDF_POOL.shutdown)
 
 
 # ---------- Utility functions -----------------------------------------------
 
-def extract_text_from_pdf(file_stream: io.BytesIO) -> str:
+def extract_text_from_pdf(file_stream: IO[bytes]) -> str:
+    if pymupdf:
+        pdf_bytes = file_stream.read()
+        with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+            if doc.page_count < PARALLEL_PDF_MIN_PAGES:
+                return "\n".join(page.get_text("text") for page in doc)
+            n_pages = doc.page_count
+        # One contiguous range per worker, so the PDF is pickled once per
+        # worker rather than once per page.
+        step = -(-n_pages // PDF_POOL_WORKERS)
+        try:
+            futures = [
+                PDF_POOL.submit(extract_page_range, pdf_bytes, start, min(start + step, n_pages))
+                for start in range(0, n_pages, step)
+            ]
+            return "\n".join(f.result() for f in futures)
+        except (RuntimeError, AssertionError) as e:
+            # BrokenProcessPool (a killed worker) is a RuntimeError; a daemonic
+            # parent that can't fork children asserts. Either way the upload
+            # is still parseable here, just without the speed-up.
+            print("PDF pool unavailable, extracting inline:", repr(e))
+            return extract_page_range(pdf_bytes, 0, n_pages)
     if not pdfplumber:
-        raise RuntimeError("pdfplumber not installed on server")
+        raise RuntimeError("PyMuPDF not installed on server")
     text_chunks = []
     with pdfplumber.open(file_stream) as pdf:
         for page in pdf.pages:
@@ -66,7 +162,7 @@ def extract_text_from_pdf(file_stream: io.BytesIO) -> str:
     return "\n".join(text_chunks)
 
 
-def extract_text_from_docx(file_stream: io.BytesIO) -> str:
+def extract_text_from_docx(file_stream: IO[bytes]) -> str:
     if not docx:
         raise RuntimeError("python‑docx not installed on server")
     document = docx.Document(file_stream)
@@ -77,134 +173,541 @@ def allowed_extension(filename: str) -> bool:
     return filename.lower().endswith((".pdf", ".docx"))
 
 
-def read_resume_or_desc(field_name: str) -> str:
-    """Return textual content for resume or job description.
+def analysis_cache_key(resume: str, job_description: str) -> str:
+    return hashlib.sha256(f"{resume}\0{job_description}".encode()).hexdigest()
+
+
+async def read_resume_or_desc(
+    files: "MultiDict[str, FileStorage]", form: "MultiDict[str, str]", field_name: str
+) -> str:
+    """Return textual content for resume or job description from a form body.
 
-    Priority: file upload → textarea / JSON input.
+    Priority: file upload (``<field_name>_file``) → textarea.
     """
-    # 1️⃣ File upload (only for form/multipart requests):
-    if field_name in request.files and request.files[field_name]:
-        f = request.files[field_name]
-        if f.filename and allowed_extension(f.filename):
-            ext = os.path.splitext(f.filename)[1].lower()
-            file_bytes = io.BytesIO(f.read())
-            try:
-                if ext == ".pdf":
-                    return extract_text_from_pdf(file_bytes)
-                elif ext == ".docx":
-                    return extract_text_from_docx(file_bytes)
-            except Exception as e:  # pragma: no cover
-                # Return empty string so downstream validation fails cleanly.
-                print("File‑parse error:", e)
-                return ""
-    # 2️⃣ Fallback to textarea (form) or JSON payload:
-    if request.form:
-        return request.form.get(field_name.replace("_file", ""), "").strip()
-    #return (request.json or {}).get(field_name.replace("_file", ""), "").strip()
-    val = (request.json or {}).get(field_name.replace("_file", ""))
-    return val.strip() if isinstance(val, str) else ""
+    # 1️⃣ File upload:
+    f = files.get(f"{field_name}_file")
+    if f and f.filename and allowed_extension(f.filename):
+        ext = os.path.splitext(f.filename)[1].lower()
+        # Hand the spooled upload straight to the parsers instead of
+        # copying it into a BytesIO; only buffer streams we can't rewind.
+        file_stream = f.stream
+        if file_stream.seekable():
+            file_stream.seek(0)
+        else:
+            file_stream = io.BytesIO(f.read())
+        loop = asyncio.get_running_loop()
+        try:
+            if ext == ".pdf":
+                return await loop.run_in_executor(EXECUTOR, extract_text_from_pdf, file_stream)
+            elif ext == ".docx":
+                return await loop.run_in_executor(EXECUTOR, extract_text_from_docx, file_stream)
+        except Exception as e:  # pragma: no cover
+            # Return empty string so downstream validation fails cleanly.
+            print("File‑parse error:", e)
+            return ""
+    # 2️⃣ Fallback to textarea:
+    return form.get(field_name, "").strip()
+
+
+async def read_inputs() -> Tuple[str, str]:
+    """Return the (resume, job description) texts, parsing the body only once.
+
+    Dispatches on the request mimetype: JSON bodies carry both fields as
+    strings, anything else is read as a (multipart) form.
+    """
+    if request.mimetype == "application/json":
+        data = await request.get_json(silent=True)
+        if not isinstance(data, dict):
+            data = {}
+
+        def text(key: str) -> str:
+            val = data.get(key)
+            return val.strip() if isinstance(val, str) else ""
+
+        return text("resume"), text("job_desc")
+
+    files = await request.files
+    form = await request.form
+    resume, job_description = await asyncio.gather(
+        read_resume_or_desc(files, form, "resume"),
+        read_resume_or_desc(files, form, "job_desc"),
+    )
+    return resume, job_description
 
 
 # ---------- Prompt builder ---------------------------------------------------
 
-def build_prompt( resume: str, job_description: str)-> str:
+# Inputs are trimmed to these token budgets so a pasted 50-page PDF can't
+# blow up prefill latency and cost.
+RESUME_TOKEN_LIMIT = 3000
+JOB_DESC_TOKEN_LIMIT = 2000
+# Rough budget used instead while the tokenizer isn't loaded.
+CHARS_PER_TOKEN = 4
+# A failed tokenizer load is retried no more often than this.
+TOKENIZER_RETRY_SECONDS = 60
+
+_tokenizer: Optional["tiktoken.Encoding"] = None
+_tokenizer_load: Optional[Future] = None
+_tokenizer_retry_at = 0.0
+
+
+def _load_tokenizer() -> None:
+    global _tokenizer
+    try:
+        _tokenizer = tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception as e:
+        print("tiktoken unavailable, truncating by characters:", e)
+
+
+def _encoding() -> Optional["tiktoken.Encoding"]:
+    """Return the tokenizer if it has loaded, starting a background load if not.
+
+    Never blocks: a cold cache downloads o200k_base with no timeout, so the
+    load runs on EXECUTOR and callers get None until it lands. Point
+    TIKTOKEN_CACHE_DIR at a prefetched copy for deploys without outbound access.
+    """
+    global _tokenizer_load, _tokenizer_retry_at
+    if (
+        _tokenizer is None
+        and (_tokenizer_load is None or _tokenizer_load.done())
+        and time.monotonic() >= _tokenizer_retry_at
+    ):
+        _tokenizer_retry_at = time.monotonic() + TOKENIZER_RETRY_SECONDS
+        _tokenizer_load = EXECUTOR.submit(_load_tokenizer)
+    return _tokenizer
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    encoding = _encoding()
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        print(f"Truncating prompt input from {len(text)} to {max_chars} characters")
+        return text[:max_chars]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    print(f"Truncating prompt input from {len(tokens)} to {max_tokens} tokens")
+    return encoding.decode(tokens[:max_tokens])
+
+
+_SYSTEM_PROMPT = (
+    "You are an expert technical career coach. "
+    "Compare the candidate's resume to the position description. "
+    "Identify skill gaps, missing keywords, and concrete improvements. "
+    "Output structured advice in four sections:\n"
+    "1. Overall Fit Summary (2‑3 sentences)\n"
+    "2. Missing or Weak Keywords/Skills (bullet list)\n"
+    "3. Resume Improvement Suggestions (bullet list)\n"
+    "4. General Job‑Search Advice (≤150 words)"
+)
+
+
+def build_prompt(resume: str, job_description: str) -> Tuple[str, str]:
     """Return the system/user prompt for GPT."""
+    resume = _truncate(resume, RESUME_TOKEN_LIMIT)
+    job_description = _truncate(job_description, JOB_DESC_TOKEN_LIMIT)
+    return _SYSTEM_PROMPT, f"[RESUME]\n{resume}\n\n[JOB_DESCRIPTION]\n{job_description}"
+
+# ---------- Request batching ------------------------------------------------
+
+# (resume, job_description, future) triples waiting for the next batch.
+batch_queue: "asyncio.Queue[Tuple[str, str, asyncio.Future]]" = asyncio.Queue()
+batch_task: Optional[asyncio.Task] = None
+# Strong references to batches whose completion is still in flight.
+pending_batches: Set[asyncio.Task] = set()
+
+ANALYSIS_KEYS = ("fit_summary", "missing_keywords", "suggestions", "general_advice")
+
+# Independent of the batch size so every call shares the same static prefix.
+_BATCH_SYSTEM_PROMPT = (
+    "You are an expert technical career coach. "
+    "You will receive numbered (resume, job description) pairs. "
+    "For each pair, compare the candidate's resume to the position description "
+    "and identify skill gaps, missing keywords, and concrete improvements. "
+    'Return a JSON object {"results": [...]} holding one object per pair, '
+    "each with keys:\n"
+    '"pair": the number N from that pair\'s [PAIR N] header\n'
+    '"fit_summary": overall fit summary (2‑3 sentences)\n'
+    '"missing_keywords": array of missing or weak keywords/skills\n'
+    '"suggestions": array of resume improvement suggestions\n'
+    '"general_advice": general job‑search advice (≤150 words)\n'
+    '"confidence": number from 0 to 1, how well the inputs support this analysis'
+)
+
 
-    system_prompt = (
-        "You are an expert technical career coach. "
-        "Compare the candidate's resume to the position description. "
-        "Identify skill gaps, missing keywords, and concrete improvements. "
-        "Output structured advice in four sections:\n"
-        "1. Overall Fit Summary (2‑3 sentences)\n"
-        "2. Missing or Weak Keywords/Skills (bullet list)\n"
-        "3. Resume Improvement Suggestions (bullet list)\n"
-        "4. General Job‑Search Advice (≤150 words)"
+def build_batch_prompt(pairs: List[Tuple[str, str]]) -> Tuple[str, str]:
+    """Return the system/user prompt evaluating several pairs in one call."""
+    sections = [
+        f"Evaluate the following {len(pairs)} pairs and return exactly {len(pairs)} results."
+    ]
+    sections.extend(
+        f"[PAIR {i}]\n[RESUME]\n{_truncate(resume, RESUME_TOKEN_LIMIT)}\n\n"
+        f"[JOB_DESCRIPTION]\n{_truncate(job_description, JOB_DESC_TOKEN_LIMIT)}"
+        for i, (resume, job_description) in enumerate(pairs, 1)
     )
+    return _BATCH_SYSTEM_PROMPT, "\n\n".join(sections)
+
+
+def parse_batch_results(content: str, expected: int) -> List[Dict[str, Any]]:
+    """Split the model's JSON reply back into one analysis per pair, in pair order.
+
+    Results are matched to pairs by their ``pair`` number, never by position,
+    so a reordered reply can't hand one user's analysis to another. Missing,
+    duplicate or unknown numbers make the whole reply malformed.
+
+    Sections are normalized to text or lists of text before anything can be
+    cached or rendered: list items are stringified, and any other value is
+    dropped so ``is_confident`` treats that section as missing.
+    """
+    try:
+        results = orjson.loads(content)["results"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Malformed batch response: {e}") from e
+    if not isinstance(results, list) or len(results) != expected:
+        raise ValueError(f"Expected {expected} analyses in batch response")
+
+    by_pair: Dict[int, Dict[str, Any]] = {}
+    for result in results:
+        if not isinstance(result, dict):
+            raise ValueError("Malformed batch response: analyses must be JSON objects")
+        pair = result.pop("pair", None)
+        if type(pair) is not int or not 1 <= pair <= expected or pair in by_pair:
+            raise ValueError(f"Malformed batch response: bad pair number {pair!r}")
+        for key in ANALYSIS_KEYS:
+            value = result.get(key)
+            if isinstance(value, list):
+                result[key] = [str(item) for item in value]
+            elif not isinstance(value, str):
+                result.pop(key, None)
+        by_pair[pair] = result
+    return [by_pair[i] for i in range(1, expected + 1)]
+
+
+def is_confident(result: Any) -> bool:
+    """True when an analysis has every section and enough self-reported confidence.
+
+    Sections only need to be present as text or lists: an empty
+    ``missing_keywords`` is a valid answer for a well-matched resume.
+    """
+    if not isinstance(result, dict) or not all(
+        isinstance(result.get(key), (str, list)) for key in ANALYSIS_KEYS
+    ):
+        return False
+    confidence = result.get("confidence")
+    return isinstance(confidence, (int, float)) and confidence >= MIN_CONFIDENCE
+
+
+def format_analysis(result: Dict[str, Any]) -> str:
+    """Render one structured analysis as the four-section text report.
+
+    Used to replay cached analyses over /analyze_stream, which sends text.
+    """
+
+    def bullets(items: Any) -> str:
+        if isinstance(items, str):
+            return items
+        return "\n".join(f"- {item}" for item in items or [])
 
-    user_content = (
-        f"[RESUME]\n{resume}\n\n[JOB_DESCRIPTION]\n{job_description}"
+    return (
+        f"1. Overall Fit Summary\n{result.get('fit_summary', '')}\n\n"
+        f"2. Missing or Weak Keywords/Skills\n{bullets(result.get('missing_keywords'))}\n\n"
+        f"3. Resume Improvement Suggestions\n{bullets(result.get('suggestions'))}\n\n"
+        f"4. General Job‑Search Advice\n{result.get('general_advice', '')}"
     )
 
-    return system_prompt, user_content
-
-# ---------- Flask app --------------------------------------------------------
-
-app = Flask(__name__)
-
-HTML_FORM = """
-<!doctype html>
-<title>Why Was I Rejected?</title>
-<h1>Why Was I Rejected?</h1>
-<form method="post" action="/analyze" enctype="multipart/form-data" style="max-width:600px">
-  <h3>Resume</h3>
-  <input type="file" name="resume_file" accept=".pdf,.docx">
-  <br><small>or paste below</small><br>
-  <textarea name="resume" rows="8" cols="80"></textarea>
-  <hr>
-  <h3>Job Description</h3>
-  <input type="file" name="job_desc_file" accept=".pdf,.docx">
-  <br><small>or paste below</small><br>
-  <textarea name="job_desc" rows="8" cols="80"></textarea>
-  <br><br>
-  <button type="submit">Analyze</button>
-</form>
-{% if result %}
-<hr>
-<h2>Analysis</h2>
-<pre>{{ result }}</pre>
-{% endif %}
-"""
 
+async def complete_batch(pairs: List[Tuple[str, str]], tier: str) -> List[Dict[str, Any]]:
+    """Analyze pairs on ``tier``'s model, escalating weak results a tier up."""
+    tiers = list(MODEL_TIERS)
+    next_tier = tiers[tiers.index(tier) + 1] if tier != tiers[-1] else None
+
+    system_prompt, user_prompt = build_batch_prompt(pairs)
+    response = await client.chat.completions.create(
+        model=MODEL_TIERS[tier],
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0.3,
+        max_tokens=800 * len(pairs),
+        response_format={"type": "json_object"},
+    )
+    try:
+        results = parse_batch_results(response.choices[0].message.content, len(pairs))
+    except ValueError:
+        if next_tier is None:
+            raise
+        return await complete_batch(pairs, next_tier)
+
+    weak = [i for i, result in enumerate(results) if not is_confident(result)]
+    if weak and next_tier is not None:
+        retried = await complete_batch([pairs[i] for i in weak], next_tier)
+        for i, result in zip(weak, retried):
+            results[i] = result
+    return results
+
+
+async def run_batch(batch: List[Tuple[str, str, asyncio.Future]]) -> None:
+    """Analyze one batch and resolve every waiter's future."""
+    try:
+        results = await complete_batch(
+            [(resume, job_description) for resume, job_description, _ in batch], MODEL_TIER
+        )
+    except Exception as e:
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    # complete_batch returns results in pair order, already matched by id.
+    for (_, _, future), result in zip(batch, results):
+        if not future.done():
+            future.set_result(result)
+
+
+async def batch_worker() -> None:
+    """Drain the queue into batches and dispatch each one without waiting."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await batch_queue.get()]
+        deadline = loop.time() + BATCH_TIMEOUT_MS / 1000
+        while len(batch) < BATCH_MAX_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(batch_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        task = asyncio.create_task(run_batch(batch))
+        pending_batches.add(task)
+        task.add_done_callback(pending_batches.discard)
+
+# ---------- Quart app --------------------------------------------------------
+
+class ORJSONProvider(JSONProvider):
+    """Route the app's JSON handling (jsonify, get_json) through orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+app = Quart(__name__)
+app.json = ORJSONProvider(app)
+app.config.update(
+    COMPRESS_ALGORITHM=["br", "gzip"],
+    COMPRESS_MIN_SIZE=500,
+    COMPRESS_LEVEL=6,
+    COMPRESS_BR_LEVEL=4,
+    COMPRESS_MIMETYPES=["text/html", "application/json"],
+)
+
+
+MISSING_INPUT_ERROR = (
+    "Both resume and job description are required — either upload a PDF/DOCX or paste the text."
+)
+
+# Inputs shorter than this, or mostly non-letters (e.g. a scanned PDF that
+# extracted to symbols), can only produce a useless analysis; reject them
+# before spending an OpenAI call.
+MIN_INPUT_CHARS = 200
+MIN_ALPHA_RATIO = 0.5
+UNREADABLE_INPUT_ERROR = (
+    f"Resume and job description must each contain at least {MIN_INPUT_CHARS} "
+    "characters of readable text."
+)
+
+
+def looks_like_text(text: str) -> bool:
+    if len(text) < MIN_INPUT_CHARS:
+        return False
+    # Measure letters against visible characters only, so spacing and PDF
+    # layout newlines don't push a real resume under the ratio.
+    visible = [c for c in text if not c.isspace()]
+    return bool(visible) and sum(c.isalpha() for c in visible) / len(visible) > MIN_ALPHA_RATIO
+
+
+def input_error(resume: str, job_description: str) -> Optional[str]:
+    """Return why the inputs can't be analyzed, or None if they look usable."""
+    if not resume or not job_description:
+        return MISSING_INPUT_ERROR
+    if not looks_like_text(resume) or not looks_like_text(job_description):
+        return UNREADABLE_INPUT_ERROR
+    return None
+
+
+@app.after_request
+async def compress_response(response: Response) -> Response:
+    """Brotli/gzip-encode buffered HTML and JSON bodies the client accepts.
+
+    The SSE stream is left alone: its mimetype isn't listed and compressing
+    it would hold deltas back in the encoder.
+    """
+    # Werkzeug's Accept parsing honours q-values, so "br;q=0" opts out.
+    algorithm = next(
+        (
+            name
+            for name in app.config["COMPRESS_ALGORITHM"]
+            if request.accept_encodings[name] > 0 and (name != "br" or brotli)
+        ),
+        None,
+    )
+    if (
+        algorithm is None
+        or response.mimetype not in app.config["COMPRESS_MIMETYPES"]
+        or not 200 <= response.status_code < 300
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    data = await response.get_data()
+    if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    # Runs on the event loop, so use Flask-Compress's fast default levels
+    # rather than the libraries' maximums (br q11 / gzip 9).
+    if algorithm == "br":
+        response.set_data(brotli.compress(data, quality=app.config["COMPRESS_BR_LEVEL"]))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=app.config["COMPRESS_LEVEL"]))
+    response.headers["Content-Encoding"] = algorithm
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+
+@app.before_serving
+async def open_openai_client() -> None:
+    global client
+    client = AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=DefaultAioHttpClient(limits=OPENAI_CONNECTION_LIMITS),
+    )
+
+
+@app.before_serving
+async def load_tokenizer() -> None:
+    # Start fetching the BPE file without holding up startup; requests are
+    # truncated by characters until it arrives.
+    _encoding()
+
+
+@app.before_serving
+async def start_batch_worker() -> None:
+    global batch_task
+    batch_task = asyncio.create_task(batch_worker())
+
+
+@app.after_serving
+async def stop_batch_worker() -> None:
+    if batch_task is not None:
+        batch_task.cancel()
+
+
+@app.after_serving
+async def close_openai_client() -> None:
+    if client is not None:
+        await client.close()
+
+
+@app.after_serving
+async def stop_pdf_pool() -> None:
+    # Hypercorn workers run non-daemonic, and multiprocessing joins a
+    # non-daemonic worker's children before atexit handlers run, so the pool
+    # has to be gone by now or the worker never exits.
+    PDF_POOL.shutdown()
 
 
 @app.route("/", methods=["GET"])
-def index():
-    return render_template_string(HTML_FORM, result=None)
+async def index():
+    return await render_template("index.html", result=None)
 
 
 @app.route("/health", methods=["GET"])
-def health() -> Dict[str, str]:
+async def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
 @app.route("/analyze", methods=["POST"])
-def analyze():
-    resume_text = read_resume_or_desc("resume_file")
-    job_desc_text = read_resume_or_desc("job_desc_file")
-
-    if not resume_text or not job_desc_text:
-        return (
-            jsonify(
-                {
-                    "error": "Both resume and job description are required — either upload a PDF/DOCX or paste the text."
-                }
-            ),
-            400,
-        )
+async def analyze():
+    resume_text, job_desc_text = await read_inputs()
 
-    system_prompt, user_prompt = build_prompt(resume_text, job_desc_text)
+    error = input_error(resume_text, job_desc_text)
+    if error:
+        return jsonify({"error": error}), 400
 
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-            max_tokens=800,
-        )
-    except openai.error.OpenAIError as e:
-        return jsonify({"error": str(e)}), 500
+    cache_key = analysis_cache_key(resume_text, job_desc_text)
+    result = analysis_cache.get(cache_key)
+    cached = result is not None
+
+    if not cached:
+        future = asyncio.get_running_loop().create_future()
+        await batch_queue.put((resume_text, job_desc_text, future))
 
-    analysis = response.choices[0].message.content.strip()
+        try:
+            result = await future
+        except (openai.OpenAIError, ValueError) as e:
+            return jsonify({"error": str(e)}), 500
+        analysis_cache[cache_key] = result
 
     # JSON API support remains intact
-    if request.content_type and request.content_type.startswith("application/json"):
-        return jsonify({"analysis": analysis})
-    return render_template_string(HTML_FORM, result=analysis)
+    if request.mimetype == "application/json":
+        return jsonify({"analysis": result, "cached": cached})
+    return await render_template("index.html", result=result)
+
 
+def sse_message(payload: Dict[str, str]) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+@app.route("/analyze_stream", methods=["POST"])
+async def analyze_stream():
+    """Stream the analysis as server-sent events of ``{"delta": ...}``."""
+    resume_text, job_desc_text = await read_inputs()
+
+    error = input_error(resume_text, job_desc_text)
+    if error:
+        return jsonify({"error": error}), 400
+
+    cache_key = analysis_cache_key(resume_text, job_desc_text)
+    cached = analysis_cache.get(cache_key)
+    replay = format_analysis(cached) if cached is not None else stream_cache.get(cache_key)
+    system_prompt, user_prompt = build_prompt(resume_text, job_desc_text)
 
-if __name__ == "__main__":
-    port = int(os.getenv("PORT", 5000))
-    app.run(host="0.0.0.0", port=port, debug=False, use_reloader=False)
+    async def events():
+        if replay is not None:
+            # Replay a finished analysis as a single delta.
+            yield sse_message({"delta": replay})
+            return
+        parts: List[str] = []
+        try:
+            stream = await client.chat.completions.create(
+                model=MODEL_TIERS[STREAM_MODEL_TIER],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=0.3,
+                max_tokens=800,
+                stream=True,
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield sse_message({"delta": parts[-1]})
+        except openai.OpenAIError as e:
+            yield sse_message({"error": str(e)})
+            return
+        # Only a stream that ran to completion is worth replaying.
+        if parts:
+            stream_cache[cache_key] = "".join(parts)
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    return response
@@ -0,0 +1,18 @@
+"""
+Hypercorn settings for serving the analyzer in production:
+$ hypercorn --config file:hypercorn_conf.py app:app
+"""
+
+import os
+
+bind = [f"0.0.0.0:{os.getenv('PORT', '5000')}"]
+
+# Views are async, so each worker's event loop multiplexes many in-flight
+# OpenAI calls; extra workers only add cores for file parsing. The batch
+# queue and analysis cache are per process, so keep the count small.
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = "asyncio"
+keep_alive_timeout = 75
+# Workers must not be daemonic: a daemonic process may not have children, and
+# each worker forks a process pool to parse long PDFs.
+daemon = False
@@ -0,0 +1,14 @@
+"""
+Process-pool worker for parallel PDF text extraction.
+
+Kept apart from app.py so forkserver workers can import it without the
+app's startup side effects (env checks, tiktoken, pools, the Quart app).
+"""
+
+import pymupdf  # type: ignore
+
+
+def extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> str:
+    """Return the text of pages ``start`` to ``stop - 1``, one page per line block."""
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return "\n".join(doc[i].get_text("text") for i in range(start, stop))